@@ -1,24 +1,69 @@
 """main.py"""
 
+import atexit
+import functools
 import logging
-import json
+import os
 from tempfile import mkdtemp
 
-import boto3
-from botocore.exceptions import ClientError
+import orjson
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 
+from objectwrapper import ObjectWrapper
+
 logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# One temp root per container for Chrome's scratch dirs; created once at
+# import instead of three mkdtemp() calls per driver launch
+_CHROME_TMP = mkdtemp(prefix="chr-")
+
+
+def _boto_config():
+    """
+    Build the shared botocore client config. Keep-alive lets warm
+    invocations reuse the pooled socket instead of paying a fresh TCP+TLS
+    handshake per request.
+    """
+    from botocore.config import Config
+
+    return Config(
+        tcp_keepalive=True,
+        retries={"mode": "standard", "max_attempts": 3},
+        connect_timeout=3,
+        read_timeout=10,
+    )
+
+
+# boto3 is imported lazily inside the cached getters so cold starts that
+# never touch AWS skip its import cost entirely; the cache keeps the
+# session, credentials and connection pool warm across invocations
+@functools.cache
+def _get_s3():
+    import boto3
+    from botocore.config import Config
+
+    # TLS already provides transit integrity, so skip SigV4 payload
+    # hashing and its second read of every upload body
+    config = _boto_config().merge(Config(s3={"payload_signing_enabled": False}))
+    return boto3.client("s3", config=config)
+
+
+@functools.cache
+def _get_sns():
+    import boto3
+
+    return boto3.client("sns", config=_boto_config())
 
 
 def initialise_driver():
     """
     Initialise Chrome driver
     """
-    print("Initialising driver")
+    logger.info("Initialising driver")
     chrome_options = ChromeOptions()
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
@@ -27,12 +72,47 @@ def initialise_driver():
     chrome_options.add_argument("--disable-dev-tools")
     chrome_options.add_argument("--no-zygote")
     chrome_options.add_argument("--single-process")
-    chrome_options.add_argument(f"--user-data-dir={mkdtemp()}")
-    chrome_options.add_argument(f"--data-path={mkdtemp()}")
-    chrome_options.add_argument(f"--disk-cache-dir={mkdtemp()}")
+    user_dir, data_dir, cache_dir = (
+        os.path.join(_CHROME_TMP, sub) for sub in ("user", "data", "cache")
+    )
+    for path in (user_dir, data_dir, cache_dir):
+        os.makedirs(path, exist_ok=True)
+    chrome_options.add_argument(f"--user-data-dir={user_dir}")
+    chrome_options.add_argument(f"--data-path={data_dir}")
+    chrome_options.add_argument(f"--disk-cache-dir={cache_dir}")
     chrome_options.add_argument("--remote-debugging-pipe")
-    chrome_options.add_argument("--verbose")
-    chrome_options.add_argument("--log-path=/tmp")
+    # Suppress background features, metrics and first-run work that cost
+    # startup time and memory but add nothing headless
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-breakpad")
+    chrome_options.add_argument("--disable-client-side-phishing-detection")
+    chrome_options.add_argument("--disable-component-extensions-with-background-pages")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument(
+        "--disable-features=TranslateUI,BlinkGenPropertyTrees,"
+        "IsolateOrigins,site-per-process"
+    )
+    chrome_options.add_argument("--disable-hang-monitor")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--disable-prompt-on-repost")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--metrics-recording-only")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--safebrowsing-disable-auto-update")
+    chrome_options.add_argument("--password-store=basic")
+    chrome_options.add_argument("--use-mock-keychain")
+    chrome_options.add_argument("--hide-scrollbars")
+    # Titles are all we scrape, so skip image bytes entirely
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from driver.get at DOMContentLoaded instead of the full load
+    # event; the title is available as soon as the HTML is parsed
+    chrome_options.page_load_strategy = "eager"
     chrome_options.binary_location = "/opt/chrome/chrome-linux64/chrome"
 
     service = Service(
@@ -42,30 +122,83 @@ def initialise_driver():
 
     driver = webdriver.Chrome(service=service, options=chrome_options)
 
+    # Block downloads and heavy resource fetches at the CDP level so page
+    # loads spend their time on the HTML alone
+    driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "deny"})
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd(
+        "Network.setBlockedURLs",
+        {
+            "urls": [
+                "*.png",
+                "*.jpg",
+                "*.jpeg",
+                "*.gif",
+                "*.webp",
+                "*.svg",
+                "*.woff",
+                "*.woff2",
+                "*.ttf",
+                "*.otf",
+                "*.mp3",
+                "*.mp4",
+                "*.webm",
+            ]
+        },
+    )
+
     return driver
 
 
-def put_object(data, bucket, object_key):
+# Chrome takes seconds to launch, so one driver is kept for the lifetime
+# of the Lambda container and reused across warm invocations
+_DRIVER = None
+
+
+def _get_driver():
     """
-    ...
+    Return the container-wide Chrome driver, initialising it on first use
+    """
+    global _DRIVER
+    if _DRIVER is None:
+        _DRIVER = initialise_driver()
+    return _DRIVER
+
+
+def _reset_driver(driver):
     """
-    s3_resource = boto3.resource("s3")
-    bucket = s3_resource.Bucket(bucket)
+    Clear page state so the next invocation starts from a blank slate
+    """
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+@atexit.register
+def _quit_driver():
+    if _DRIVER is not None:
+        _DRIVER.quit()
 
-    obj_wrapper = ObjectWrapper(bucket.Object(object_key))
 
-    object_list = ObjectWrapper.list(bucket)
-    print(f"Current object keys are: '{', '.join(o.key for o in object_list)}'")
+# Launch Chrome while the module is imported during Lambda's INIT phase,
+# which is billed separately and pre-warmed, so the first invocation
+# skips the multi-second browser startup. Guarded so importing the
+# module outside Lambda doesn't spawn a browser.
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    _get_driver()
+
+
+def put_object(data, bucket, object_key):
+    """
+    ...
+    """
+    obj_wrapper = ObjectWrapper(_get_s3(), bucket, object_key)
 
     if isinstance(data, str):
         obj_wrapper.put(data.encode(encoding="utf-8"))
     else:
         obj_wrapper.put(data)
 
-    print(f"Have put '{data}' into object '{object_key}'")
-
-    object_list = ObjectWrapper.list(bucket)
-    print(f"Object keys are: {', '.join(o.key for o in object_list)}")
+    logger.info("Have put '%s' into object '%s'", data, object_key)
 
 
 def send_email(sns_topic_arn, subject_text, body_text):
@@ -73,20 +206,19 @@ def send_email(sns_topic_arn, subject_text, body_text):
     ...
     """
 
-    sns_client = boto3.client("sns")
-    response = sns_client.publish(
+    response = _get_sns().publish(
         TopicArn=sns_topic_arn,
         Subject=subject_text,
         Message=body_text,
     )
 
-    print(f"Email sent with response: {response}")
+    logger.info("Email sent with response: %s", response)
 
     return {
         "statusCode": 200,
-        "body": json.dumps(
+        "body": orjson.dumps(
             f"Email send success. MessageID is: '{response['MessageId']}'"
-        ),
+        ).decode(),
     }
 
 
@@ -94,31 +226,40 @@ def lambda_handler(event, context):
     """
     AWS Lambda handler
     """
-    print(f"Entered `lambda_handler()` with '{event}' and {context}")
+    logger.info("Entered `lambda_handler()` with '%s' and %s", event, context)
 
     test_url = event.get("test-url", "")
-    print(f"Init driver and getting url '{test_url}'")
-    driver = initialise_driver()
+    logger.info("Init driver and getting url '%s'", test_url)
+    driver = _get_driver()
     driver.get(test_url)
-    print(f"Page title: '{driver.title}'")
+    # Each driver.title access is a round-trip to Chrome, so read it once
+    title = driver.title
+    logger.info("Page title: '%s'", title)
 
-    body = {"title": driver.title}
+    body = {"title": title}
+
+    _reset_driver(driver)
 
     s3_bucket = event.get("s3-bucket", "")
     s3_object_key = event.get("s3-object-key", "")
 
-    print(f"Putting '{test_url}' into object '{s3_object_key}' in bucket '{s3_bucket}'")
+    logger.info(
+        "Putting '%s' into object '%s' in bucket '%s'",
+        test_url,
+        s3_object_key,
+        s3_bucket,
+    )
     put_object(test_url, s3_bucket, s3_object_key)
 
     sns_topic_arn = event.get("sns-topic-arn")
     subject_text = event.get("email-subject", "")
     body_text = event.get("email-body", "")
 
-    print(
-        "Trying email send from "
-        f"sns_topic_arn '{sns_topic_arn}' "
-        f"subject '{subject_text}' "
-        f"body '{body_text}' "
+    logger.info(
+        "Trying email send from sns_topic_arn '%s' subject '%s' body '%s'",
+        sns_topic_arn,
+        subject_text,
+        body_text,
     )
 
     email_response = send_email(sns_topic_arn, subject_text, body_text)
@@ -128,181 +269,7 @@ def lambda_handler(event, context):
     response = {
         "statusCode": 200,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(response_body),
+        "body": orjson.dumps(response_body).decode(),
     }
 
     return response
-
-
-class ObjClientExceptions(ClientError):
-    """Encapsulates boto client exceptions"""
-
-
-class ObjectWrapper:
-    """Encapsulates S3 object actions"""
-
-    def __init__(self, s3_object):
-        """
-        Args:
-            s3_object: A Boto3 object resource
-        """
-        self.object = s3_object
-        self.key = self.object.key
-
-    def put(self, data):
-        """
-        Upload data to the object
-
-        Args:
-            data: The data (bytes or string) to upload. When this is a string,
-            it is interpreted as a file name, which is  opened in read bytes
-            mode.
-        """
-        put_data = data
-        if isinstance(data, str):
-            try:
-                put_data = open(data, "rb")
-            except IOError:
-                logger.exception("Expected file name or binary data, got '%s'.", data)
-                raise
-
-        try:
-            self.object.put(Body=put_data)
-            self.object.wait_until_exists()
-            print(
-                f"Put object '{self.object.key}' to bucket '{self.object.bucket_name}'."
-            )
-        except ObjClientExceptions:
-            logger.exception(
-                "Couldn't put object '%s' to bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-            raise
-        finally:
-            if getattr(put_data, "close", None):
-                put_data.close()
-
-    def get(self):
-        """
-        Gets the object
-
-        Return:
-            The object data in bytes.
-        """
-        try:
-            body = self.object.get()["Body"].read()
-            print(
-                "Got object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-        except ObjClientExceptions:
-            logger.exception(
-                "Couldn't get object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-            raise
-        else:
-            return body
-
-    @staticmethod
-    def list(bucket, prefix=None):
-        """
-        Lists the objects in a bucket, optionally filtered by a prefix.
-
-        Args:
-            bucket: The Boto3 bucket to query
-            prefix: When specified, only objects that start with this prefix are
-            listed.
-
-        Return:
-            The list of objects.
-        """
-        try:
-            if not prefix:
-                objects = list(bucket.objects.all())
-            else:
-                objects = list(bucket.objects.filter(Prefix=prefix))
-            print(
-                "Got objects %s from bucket '%s'", [o.key for o in objects], bucket.name
-            )
-        except ObjClientExceptions:
-            logger.exception("Couldn't get objects for bucket '%s'.", bucket.name)
-            raise
-        else:
-            return objects
-
-    def delete(self):
-        """
-        Deletes the object
-        """
-        try:
-            self.object.delete()
-            self.object.wait_until_not_exists()
-            print(
-                "Deleted object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-        except ObjClientExceptions:
-            logger.exception(
-                "Couldn't delete object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-            raise
-
-    @staticmethod
-    def delete_objects(bucket, object_keys):
-        """
-        Removes a list of objects from a bucket. This operation is done as a
-        batch in a single request.
-
-        Args:
-            bucket: The Boto3 bucket that contains the objects
-            object_keys: The list of keys that identify the objects to remove
-        Return:
-            The response that contains data about which objects were and were
-            not deleted
-        """
-        try:
-            response = bucket.delete_objects(
-                Delete={"Objects": [{"Key": key} for key in object_keys]}
-            )
-            if "Deleted" in response:
-                print(
-                    "Deleted objects '%s' from bucket '%s'.",
-                    [del_obj["Key"] for del_obj in response["Deleted"]],
-                    bucket.name,
-                )
-            if "Errors" in response:
-                logger.warning(
-                    "Could not delete objects '%s' from bucket '%s'.",
-                    [
-                        f"{del_obj['Key']}: {del_obj['Code']}"
-                        for del_obj in response["Errors"]
-                    ],
-                    bucket.name,
-                )
-        except ObjClientExceptions:
-            logger.exception("Couldn't delete any objects from bucket %s.", bucket.name)
-            raise
-        else:
-            return response
-
-    @staticmethod
-    def empty_bucket(bucket):
-        """
-        Remove all objects from a bucket
-
-        Args:
-            bucket: The Boto3 bucket to empty
-        """
-        try:
-            bucket.objects.delete()
-            print("Emptied bucket '%s'.", bucket.name)
-        except ObjClientExceptions:
-            logger.exception("Couldn't empty bucket '%s'.", bucket.name)
-            raise
@@ -1,61 +1,125 @@
 """Provide methods for accessing AWS S3 objects"""
 
+import functools
+import io
+import itertools
 import logging
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
 
-class ObjClientExceptions(ClientError):
-    """Encapsulates boto client exceptions"""
+@functools.cache
+def _get_transfer_config():
+    """
+    Uploads above the threshold are split into parts and put in parallel
+    by the S3 transfer manager; smaller ones stay a single request.
+    boto3 is imported lazily so importing this module stays cheap.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=8 * 1024**2,
+        multipart_chunksize=16 * 1024**2,
+        max_concurrency=10,
+        use_threads=True,
+    )
 
 
 class ObjectWrapper:
     """Encapsulates S3 object actions"""
 
-    def __init__(self, s3_object):
+    def __init__(self, client, bucket_name, key):
         """
         Args:
-            s3_object: A Boto3 object resource
+            client: A Boto3 S3 client
+            bucket_name: The name of the bucket that holds the object
+            key: The object's key
         """
-        self.object = s3_object
-        self.key = self.object.key
+        self.client = client
+        self.bucket_name = bucket_name
+        self.key = key
 
-    def put(self, data):
+    def put(self, data, wait=False, content_type=None):
         """
         Upload data to the object
 
+        File uploads go through the S3 transfer manager, which switches to
+        parallel multipart parts above the configured threshold; in-memory
+        payloads above the threshold are streamed the same way, while
+        smaller ones stay on the single-request put path.
+
         Args:
             data: The data (bytes or string) to upload. When this is a string,
             it is interpreted as a file name, which is  opened in read bytes
             mode.
+            wait: When True, poll S3 until the object is visible before
+            returning. S3 writes are strongly consistent, so the default
+            skips the poll loop.
+            content_type: The MIME type to store with the object. Guessed
+            from the file name for file uploads when not given.
         """
-        put_data = data
-        if isinstance(data, str):
-            try:
-                put_data = open(data, "rb")
-            except IOError:
-                logger.exception("Expected file name or binary data, got '%s'.", data)
-                raise
-
+        if isinstance(data, str) and content_type is None:
+            content_type = mimetypes.guess_type(data)[0]
+        content_args = {"ContentType": content_type} if content_type else {}
+        transfer_config = _get_transfer_config()
         try:
-            self.object.put(Body=put_data)
-            self.object.wait_until_exists()
-            logger.info(
-                "Put object '%s' to bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
-            )
-        except ObjClientExceptions:
+            if isinstance(data, str):
+                # upload_fileobj rather than upload_file: the latter wraps
+                # ClientError in S3UploadFailedError, which would dodge the
+                # except arm below
+                with open(data, "rb") as fileobj:
+                    self.client.upload_fileobj(
+                        fileobj,
+                        Bucket=self.bucket_name,
+                        Key=self.key,
+                        ExtraArgs=content_args or None,
+                        Config=transfer_config,
+                    )
+            elif isinstance(data, (bytes, bytearray, memoryview)):
+                # len() of a memoryview counts elements, not bytes, so size
+                # the payload via nbytes
+                nbytes = data.nbytes if isinstance(data, memoryview) else len(data)
+                if nbytes > transfer_config.multipart_threshold:
+                    self.client.upload_fileobj(
+                        io.BytesIO(data),
+                        Bucket=self.bucket_name,
+                        Key=self.key,
+                        ExtraArgs=content_args or None,
+                        Config=transfer_config,
+                    )
+                else:
+                    # Explicit ContentLength skips botocore's seek/tell
+                    # probe of the body
+                    self.client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=self.key,
+                        Body=data,
+                        ContentLength=nbytes,
+                        **content_args,
+                    )
+            else:
+                self.client.put_object(
+                    Bucket=self.bucket_name, Key=self.key, Body=data, **content_args
+                )
+            if wait:
+                self.client.get_waiter("object_exists").wait(
+                    Bucket=self.bucket_name, Key=self.key
+                )
+            logger.info("Put object '%s' to bucket '%s'.", self.key, self.bucket_name)
+        except IOError:
+            logger.exception("Expected file name or binary data, got '%s'.", data)
+            raise
+        except ClientError:
             logger.exception(
                 "Couldn't put object '%s' to bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
+                self.key,
+                self.bucket_name,
             )
             raise
-        finally:
-            if getattr(put_data, "close", None):
-                put_data.close()
 
     def get(self):
         """
@@ -65,118 +129,136 @@ class ObjectWrapper:
             The object data in bytes.
         """
         try:
-            body = self.object.get()["Body"].read()
+            body = self.client.get_object(Bucket=self.bucket_name, Key=self.key)[
+                "Body"
+            ].read()
             logger.info(
-                "Got object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
+                "Got object '%s' from bucket '%s'.", self.key, self.bucket_name
             )
-        except ObjClientExceptions:
+        except ClientError:
             logger.exception(
                 "Couldn't get object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
+                self.key,
+                self.bucket_name,
             )
             raise
         else:
             return body
 
     @staticmethod
-    def list(bucket, prefix=None):
+    def list(client, bucket_name, prefix=None):
         """
         Lists the objects in a bucket, optionally filtered by a prefix.
 
+        Pages are streamed from a list_objects_v2 paginator and yielded as
+        plain dicts, so callers never materialise the whole bucket or pay
+        for per-object resource construction.
+
         Args:
-            bucket: The Boto3 bucket to query
+            client: A Boto3 S3 client
+            bucket_name: The name of the bucket to query
             prefix: When specified, only objects that start with this prefix are
             listed.
 
         Return:
-            The list of objects.
+            A generator of object dicts, each with at least a "Key" entry.
         """
+        paginator = client.get_paginator("list_objects_v2")
         try:
-            if not prefix:
-                objects = list(bucket.objects.all())
-            else:
-                objects = list(bucket.objects.filter(Prefix=prefix))
-            logger.info(
-                "Got objects %s from bucket '%s'", [o.key for o in objects], bucket.name
-            )
-        except ObjClientExceptions:
-            logger.exception("Couldn't get objects for bucket '%s'.", bucket.name)
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix or ""):
+                contents = page.get("Contents", [])
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Got objects %s from bucket '%s'",
+                        [o["Key"] for o in contents],
+                        bucket_name,
+                    )
+                yield from contents
+        except ClientError:
+            logger.exception("Couldn't get objects for bucket '%s'.", bucket_name)
             raise
-        else:
-            return objects
 
-    def delete(self):
+    def delete(self, wait=False):
         """
         Deletes the object
+
+        Args:
+            wait: When True, poll S3 until the object is gone before
+            returning. Skipped by default; deletes are strongly consistent.
         """
         try:
-            self.object.delete()
-            self.object.wait_until_not_exists()
+            self.client.delete_object(Bucket=self.bucket_name, Key=self.key)
+            if wait:
+                self.client.get_waiter("object_not_exists").wait(
+                    Bucket=self.bucket_name, Key=self.key
+                )
             logger.info(
-                "Deleted object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
+                "Deleted object '%s' from bucket '%s'.", self.key, self.bucket_name
             )
-        except ObjClientExceptions:
+        except ClientError:
             logger.exception(
                 "Couldn't delete object '%s' from bucket '%s'.",
-                self.object.key,
-                self.object.bucket_name,
+                self.key,
+                self.bucket_name,
             )
             raise
 
     @staticmethod
-    def delete_objects(bucket, object_keys):
+    def delete_objects(client, bucket_name, object_keys):
         """
-        Removes a list of objects from a bucket. This operation is done as a
-        batch in a single request.
+        Removes a list of objects from a bucket. Keys are deleted in
+        batches of up to 1000 (the S3 per-request limit), with batches
+        issued in parallel from a bounded thread pool. Batches are sent
+        quiet, so S3 only reports the keys that failed.
 
         Args:
-            bucket: The Boto3 bucket that contains the objects
+            client: A Boto3 S3 client
+            bucket_name: The name of the bucket that contains the objects
             object_keys: The list of keys that identify the objects to remove
         Return:
-            The response that contains data about which objects were and were
-            not deleted
+            A response with the merged "Errors" entries from every batch
         """
-        try:
-            response = bucket.delete_objects(
-                Delete={"Objects": [{"Key": key} for key in object_keys]}
+        keys = iter(object_keys)
+        batches = []
+        while batch := list(itertools.islice(keys, 1000)):
+            batches.append(batch)
+
+        def _delete_batch(batch):
+            return client.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
             )
-            if "Deleted" in response:
-                logger.info(
-                    "Deleted objects '%s' from bucket '%s'.",
-                    [del_obj["Key"] for del_obj in response["Deleted"]],
-                    bucket.name,
-                )
-            if "Errors" in response:
+
+        response = {"Errors": []}
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(_delete_batch, b) for b in batches]
+                for future in as_completed(futures):
+                    response["Errors"].extend(future.result().get("Errors", []))
+            if response["Errors"] and logger.isEnabledFor(logging.WARNING):
                 logger.warning(
                     "Could not delete objects '%s' from bucket '%s'.",
                     [
                         f"{del_obj['Key']}: {del_obj['Code']}"
                         for del_obj in response["Errors"]
                     ],
-                    bucket.name,
+                    bucket_name,
                 )
-        except ObjClientExceptions:
-            logger.exception("Couldn't delete any objects from bucket %s.", bucket.name)
+        except ClientError:
+            logger.exception("Couldn't delete any objects from bucket %s.", bucket_name)
             raise
         else:
             return response
 
     @staticmethod
-    def empty_bucket(bucket):
+    def empty_bucket(client, bucket_name):
         """
         Remove all objects from a bucket
 
         Args:
-            bucket: The Boto3 bucket to empty
+            client: A Boto3 S3 client
+            bucket_name: The name of the bucket to empty
         """
-        try:
-            bucket.objects.delete()
-            logger.info("Emptied bucket '%s'.", bucket.name)
-        except ObjClientExceptions:
-            logger.exception("Couldn't empty bucket '%s'.", bucket.name)
-            raise
+        keys = (obj["Key"] for obj in ObjectWrapper.list(client, bucket_name))
+        ObjectWrapper.delete_objects(client, bucket_name, keys)
+        logger.info("Emptied bucket '%s'.", bucket_name)